@@ -2,6 +2,8 @@
 
 """ A module for the class, xpath, id and cookie strings used by the scraper """
 
+import json
+
 NO_NEW_USER_BONUS_COOKIE_NAME = 'xman_f'
 NO_NEW_USER_BONUS_COOKIE_VALUE = '93C8K8lzrDa/kn2XTH3NuFVGZmm88tesMfwSoIx0meNyrjiIsVH51j3tgrAB447oDOgJ7Nr37qHlnZ1G+WKG+87558slViUs4XSMv5/ZiTUtPZ79DBP6fz0Ju2YcLFwUEYkGyw+1L1678VhPAMMar9up1v+Mf/+C8h6uswNuYaXPVWkeQZL09R8CjQMYUMrS5xftX6l5uVoAX6ABsP0+cP4n8YyIXl4xWZ17dZ9PIg+w2d2KylfKKYQqOiemEuNMmC20ckvgNmd/c28SASRay0Ng0rzClPR5VtQxjsetbd70S2n+JQkSxxKH2izF0xtdvvL+IGCzBp11Bu6FWw70T2XVvQQMQXiasjVveURKJCRwHLBo938LFFdYFxnKpk94PXbY4k+xwvtdVaTDcmnZ6268cBr0fK1E+D61PAvLbCEQ+ytJ+dXRmREG209CGngXHNRCLbuw3wfSo9E6dZA4QgpsbsVeYAUpn5CCEa3grP4='
 COUNTRY_AND_CURRENCY_COOKIE_NAME = 'aep_usuc_f'
@@ -11,6 +13,147 @@ US_COUNTRY_AND_CURRENCY_COOKIE_VALUE = 'site=usa&c_tp={}&ups_d=1|1|1|1&ups_u_t=1
 MAIN_COOKIE_DOMAIN = '.aliexpress.com'
 US_COOKIE_DOMAIN = '.aliexpress.us'
 
+# url patterns of third party trackers and of media (only text is scraped) that the driver never loads
+BLOCKED_URLS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*facebook.net*',
+    '*hotjar.com*',
+    '*.jpg*',
+    '*.jpeg*',
+    '*.png*',
+    '*.gif*',
+    '*.webp*',
+    '*.mp4*',
+    '*.woff*',
+    '*.ttf*',
+]
+
+# classes of the popups shown when first visiting https://www.aliexpress.com
+POPUP_CLASSES = {
+    'cookies': 'btn-accept',
+    'notifications': '_24EHh',
+    'welcome': 'btn-close',
+}
+
+# milliseconds the landing page is watched for popups before giving up on them
+POPUP_WATCH_TIMEOUT = 10000
+
+# installed on every new document so that popups are closed by the browser as soon as they mount
+# only the landing page shows them, so other pages (i.e. item pages) are never watched
+# (each popup is closed only once and the observer disconnects when all of them are closed or it times out)
+CLOSE_POPUPS_SCRIPT = '''
+if (location.pathname === '/') {
+    const pending = new Set(%s);
+    const observer = new MutationObserver(() => {
+        for (const className of pending) {
+            const elem = document.getElementsByClassName(className)[0];
+            if (elem) {
+                elem.click();
+                pending.delete(className);
+            }
+        }
+        if (!pending.size) observer.disconnect();
+    });
+    observer.observe(document, {childList: true, subtree: true});
+    setTimeout(() => observer.disconnect(), %d);
+}
+''' % (json.dumps(list(POPUP_CLASSES.values())), POPUP_WATCH_TIMEOUT)
+
+# clicks the popups that are currently open and returns the classes of the ones clicked
+CLICK_POPUPS_SCRIPT = '''
+const clicked = [];
+for (const className of arguments[0]) {
+    const elem = document.getElementsByClassName(className)[0];
+    if (elem) {
+        elem.click();
+        clicked.push(className);
+    }
+}
+return clicked;
+'''
+
+# iso codes of the currencies whose prices have three decimal places
+# (a lone separator followed by three digits is their decimal separator, not a thousands one)
+THREE_DECIMAL_CURRENCIES = ('KWD', 'BHD', 'JOD', 'OMR', 'TND', 'LYD', 'IQD')
+
+# classes of the elements holding the item and shipping price, in order of preference
+ITEM_PRICE_CLASSES = ['uniform-banner-box-price', 'product-price-value']
+SHIPPING_PRICE_CLASSES = ['dynamic-shipping']
+
+# waits inside the browser (up to arguments[0] ms) until an item page's availability
+# can be determined and returns its status along with the current price texts
+# status is one of 'removed', 'unavailable', 'unreachable', 'available' or 'timeout'
+PAGE_PROBE_SCRIPT = '''
+const [timeout, itemClasses, shippingClasses, done] = arguments;
+const has = className => document.getElementsByClassName(className).length > 0;
+const firstText = classNames => {
+    for (const className of classNames) {
+        const elem = document.getElementsByClassName(className)[0];
+        if (elem && elem.innerText) return elem.innerText;
+    }
+    return '';
+};
+const probe = () => {
+    let status = null;
+    if (has('not-found-page')) status = 'removed';
+    else if (has('customs-message-wrap')) status = 'unavailable';
+    // the shipping element is present no matter the item's availability
+    else if (has('dynamic-shipping')) status = has('dynamic-shipping-unreachable') ? 'unreachable' : 'available';
+    if (!status) return null;
+    return {
+        status: status,
+        propertyCount: document.getElementsByClassName('sku-property-list').length,
+        itemText: firstText(itemClasses),
+        shippingText: firstText(shippingClasses),
+    };
+};
+
+const result = probe();
+if (result) return done(result);
+
+const observer = new MutationObserver(() => {
+    const result = probe();
+    if (result) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(result);
+    }
+});
+const timer = setTimeout(() => {
+    observer.disconnect();
+    done({status: 'timeout', propertyCount: 0, itemText: '', shippingText: ''});
+}, timeout);
+observer.observe(document, {childList: true, subtree: true});
+'''
+
+# clicks the first option that is not disabled in every item property list,
+# removes the tooltip that opens on hover and returns the index of the option
+# clicked in every list (-1 if all of its options are disabled)
+SELECT_FIRST_OPTIONS_SCRIPT = '''
+const chosen = [];
+for (const list of document.getElementsByClassName('sku-property-list')) {
+    const options = Array.from(list.getElementsByClassName('sku-property-item'));
+    const index = options.findIndex(option => !option.className.includes('disabled'));
+    if (index >= 0) options[index].click();
+    chosen.push(index);
+}
+const tooltip = document.querySelector('.next-overlay-wrapper.opened');
+if (tooltip) tooltip.remove();
+return chosen;
+'''
+
+# returns the first shipping option (with class arguments[0]) that has tracking available
+# or the first shipping option if there is none
+TRACKING_OPTION_SCRIPT = '''
+const options = document.getElementsByClassName(arguments[0]);
+for (const option of options) {
+    if ((option.innerText || '').trim() === 'Tracking Available') return option;
+}
+return options[0] || null;
+'''
+
 COUNTRY_ISO_CODE_DIR = {
     "afghanistan": "AF",
     "aland islands": "ALA",
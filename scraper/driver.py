@@ -4,11 +4,10 @@
 
 # stdlib modules
 import os
-import re
-import sys
-import time
+import atexit
 import logging
 import platform
+import threading
 
 # inner modules
 from scraper import scraperutils as utils
@@ -16,26 +15,22 @@ from scraper import scraperutils as utils
 # third party modules
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # exceptions
 from scraper.exceptions import *
 from selenium.common.exceptions import NoSuchElementException
-from selenium.common.exceptions import ElementNotInteractableException
 from selenium.common.exceptions import ElementClickInterceptedException
-from selenium.common.exceptions import TimeoutException
-from selenium.common.exceptions import NoSuchAttributeException
+from selenium.common.exceptions import WebDriverException
 
 # constants
 from scraper.const import NO_NEW_USER_BONUS_COOKIE_VALUE, NO_NEW_USER_BONUS_COOKIE_NAME, \
 COUNTRY_AND_CURRENCY_COOKIE_NAME, COUNTRY_AND_CURRENCY_COOKIE_VALUE, COUNTRY_ISO_CODE_DIR, \
-MAIN_COOKIE_DOMAIN, US_COUNTRY_AND_CURRENCY_COOKIE_VALUE, US_COOKIE_DOMAIN
+MAIN_COOKIE_DOMAIN, US_COUNTRY_AND_CURRENCY_COOKIE_VALUE, US_COOKIE_DOMAIN, POPUP_CLASSES, \
+CLOSE_POPUPS_SCRIPT, CLICK_POPUPS_SCRIPT, BLOCKED_URLS
 
 # typing
-from typing import Union
+from typing import Union, Tuple, Dict, List
 
 # typedef
 ChromeWebdriver: webdriver.chrome.webdriver.WebDriver
@@ -43,6 +38,26 @@ ChromeWebdriver = webdriver.chrome.webdriver.WebDriver
 WebElement: webdriver.remote.webelement.WebElement
 WebElement = webdriver.remote.webelement.WebElement
 
+logger = logging.getLogger(__name__)
+
+# idle drivers kept around to be reused, keyed by (country, currency, headless)
+# their cookies are already set up for that country and currency
+_POOL: Dict[Tuple[str, str, bool], List[ChromeWebdriver]]
+_POOL = {}
+_POOL_LOCK = threading.Lock()
+
+@atexit.register
+def closePool () -> None:
+    """
+    Quits all the idle drivers in the pool.
+    """
+
+    with _POOL_LOCK:
+        for drivers in _POOL.values():
+            for driver in drivers:
+                driver.quit()
+        _POOL.clear()
+
 class Driver:
     """
     A class to wrap around selenium.webdriver to use with Scraper.
@@ -51,15 +66,15 @@ class Driver:
     URL = 'https://www.aliexpress.com/'
     CHROMEDRIVER_PATH = ''
     RETRIES = 5
-    RETRY_INTERVAL = 0.5
 
-    def __init__(self, country: str, currency: str, headless: bool = True, debug: bool = False) -> None:
+    def __init__(self, country: str, currency: str, headless: bool = True, debug: bool = False, reuse: bool = False) -> None:
         self.setUpChromedriverPath()
 
         self.country = country
         self.currency = currency
         self.headless = headless
         self.debug = debug
+        self.reuse = reuse
 
         # enable info level logging when headless
         if headless:
@@ -67,22 +82,76 @@ class Driver:
         else:
             logging.getLogger().disable = True
 
-        self.driver = self.setUpDriver(self.country, self.currency, self.headless, self.debug)
+        # an idle driver from the pool is already set up so there's no need to start a new one
+        self.driver = self.takeFromPool() if reuse else None
+        if self.driver is None:
+            self.driver = self.setUpDriver(self.country, self.currency, self.headless, self.debug)
 
     def close (self) -> None:
         """
         Closes the driver.
+        If the driver is reusable it is kept open in the pool instead.
         """
-        logging.info('Closing Driver...')
+
+        if self.reuse:
+            logger.info('Returning Driver to the pool...')
+            with _POOL_LOCK:
+                _POOL.setdefault((self.country, self.currency, self.headless), []).append(self.driver)
+            return
+
+        logger.info('Closing Driver...')
         self.driver.quit()
 
+    def takeFromPool (self) -> Union[ChromeWebdriver, None]:
+        """
+        Returns an idle driver from the pool set up with the same country, currency and headless mode.
+        Returns None if there is no such driver or if it can no longer be used.
+        """
+
+        with _POOL_LOCK:
+            drivers = _POOL.get((self.country, self.currency, self.headless))
+            driver = drivers.pop() if drivers else None
+
+        if driver is None:
+            return None
+
+        # the browser may have been closed in the meantime
+        try:
+            driver.current_url
+        except WebDriverException:
+            # still stop the chromedriver service of the dead driver
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+            return None
+
+        logger.info('Reusing Driver from the pool.')
+
+        return driver
+
     def resetDriver (self) -> None:
         """
         Resets the driver itself by closing it and setting it up again.
         """
-        self.close()
+        logger.info('Closing Driver...')
+        self.driver.quit()
         self.driver = self.setUpDriver(self.country, self.currency, self.headless, self.debug)
 
+    def softReset (self) -> None:
+        """
+        Resets the driver's cookies and storage and sets its cookies up again
+        without restarting the browser, which is much faster than resetDriver.
+        """
+
+        logger.info('Soft resetting Driver...')
+
+        self.driver.delete_all_cookies()
+        self.driver.get(self.URL)
+        self.driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+
+        self.setUpCookies(driver=self.driver, country=self.country, currency=self.currency)
+
     def setUpChromedriverPath (self) -> None:
         """
         Sets up the self.CHROMEDRIVER_PATH attribute.
@@ -104,11 +173,28 @@ class Driver:
         :param currency: currency to show prices as (None for default currency)
         """
 
-        logging.info('Now setting up driver...')
+        logger.info('Now setting up driver...')
 
         # create driver
+        options = Options()
+
+        # return from page loads once the DOM is ready instead of waiting for every subresource
+        # (the elements needed are explicitly waited for anyway)
+        options.page_load_strategy = 'eager'
+
+        # only text is scraped so don't load images or show notifications
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-features=Translate,BackForwardCache')
+
         if headless:
-            options = Options()
             options.add_argument('--headless')
             options.add_argument('window-size=1920x1080')
             driver = webdriver.Chrome(self.CHROMEDRIVER_PATH, options=options)
@@ -128,66 +214,82 @@ class Driver:
             #                                  )
             # driver = webdriver.Chrome(self.CHROMEDRIVER_PATH, chrome_options=chrome_options)
         else:
-            driver = webdriver.Chrome(self.CHROMEDRIVER_PATH)
+            driver = webdriver.Chrome(self.CHROMEDRIVER_PATH, options=options)
+
+        # only explicit waits are used so make sure that lookups never block
+        driver.implicitly_wait(0)
 
         # set logging to warnings only
-        logger = logging.getLogger('selenium.webdriver.remote.remote_connection')
-        logger.setLevel(logging.WARNING)
+        seleniumLogger = logging.getLogger('selenium.webdriver.remote.remote_connection')
+        seleniumLogger.setLevel(logging.WARNING)
 
-        driver.get(self.URL)
+        # don't load third party trackers
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+
+        # close popups from inside the browser as soon as they are mounted
+        # instead of polling for each one of them through the driver
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': CLOSE_POPUPS_SCRIPT})
 
-        # set up country and currency
-        self.setUpCountryAndCurrency(driver=driver, country=country, currency=currency)
+        driver.get(self.URL)
 
-        # inject cookie to bypass the new user bonus
-        logging.info('Adding cookies to bypass the new user bonus...')
-        utils.injectCookie(driver=driver,
-                           cookieValue=NO_NEW_USER_BONUS_COOKIE_VALUE,
-                           cookieName=NO_NEW_USER_BONUS_COOKIE_NAME)
+        self.setUpCookies(driver=driver, country=country, currency=currency)
 
-        logging.info('Driver setup complete.')
+        logger.info('Driver setup complete.')
 
         return driver
 
-    def closePopups (self, driver: ChromeWebdriver) -> None:
+    def setUpCookies (self, driver: ChromeWebdriver, country: str, currency: str) -> None:
         """
-        Closes the initial popups when visiting https://www.aliexpress.com.
+        Injects all the cookies needed for scraping.
 
         :param driver: driver at https://www.aliexpress.com
+        :param country: country to ship to
+        :param currency: currency to show prices as
         """
 
-        logging.info('Closing Popups...')
+        # set up country and currency together with the cookie to bypass the new user bonus
+        logger.info('Adding cookies to bypass the new user bonus...')
+        self.setUpCountryAndCurrency(
+            driver=driver,
+            country=country,
+            currency=currency,
+            extraCookies={NO_NEW_USER_BONUS_COOKIE_NAME: NO_NEW_USER_BONUS_COOKIE_VALUE},
+            )
 
-        classes = {
-            'cookies': 'btn-accept',
-            'notifications': '_24EHh',
-            'welcome': 'btn-close',
-        }
+    def closePopups (self, driver: ChromeWebdriver) -> None:
+        """
+        Closes the initial popups when visiting https://www.aliexpress.com.
+        Popups are normally closed by the script installed in setUpDriver,
+        so this only clicks the ones that are already open.
 
-        # explicitly wait until all three popups are loaded
-        for popup, className in classes.items():
-            try:
-                WebDriverWait(driver, 3).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, className))
-                )
-                driver.find_element(By.CLASS_NAME, className).click()
+        :param driver: driver at https://www.aliexpress.com
+        """
 
-            except (NoSuchElementException, ElementNotInteractableException, TimeoutException):
-                logging.info(f'Skipping {popup} popup. If it intercepts will try to close again.')
+        logger.info('Closing Popups...')
 
-            except ElementClickInterceptedException:
-                raise ElementClickInterceptedException(f'element with name {popup} and class {className} click intercepted.')
+        # click whatever popups the installed script missed in a single call
+        clicked = driver.execute_script(CLICK_POPUPS_SCRIPT, list(POPUP_CLASSES.values()))
 
-    def setUpCountryAndCurrency (self, driver: ChromeWebdriver, country: str, currency: str) -> None:
+        for popup, className in POPUP_CLASSES.items():
+            if className not in clicked:
+                logger.info('Skipping %s popup. If it intercepts will try to close again.', popup)
+
+    def setUpCountryAndCurrency (self, driver: ChromeWebdriver, country: str, currency: str, extraCookies: Dict[str, str] = None) -> None:
         """
         Injects cookie with passed country and currency.
+        Any extra cookies are injected along with it in the same call.
 
         :param driver: driver to inject the cookie to
         :param country: country to setup the cookie with
         :param currency: currency to setup the cookie with
+        :param extraCookies: names and values of other cookies to inject
         """
 
-        logging.info('Adding cookies for selected country and currency...')
+        if extraCookies is None:
+            extraCookies = {}
+
+        logger.info('Adding cookies for selected country and currency...')
 
         countryIsoCode = COUNTRY_ISO_CODE_DIR[country.lower()]
         currencyIsoCode = currency[:3].upper()
@@ -195,10 +297,10 @@ class Driver:
         # default cookie
         cookieValue = COUNTRY_AND_CURRENCY_COOKIE_VALUE.format(currencyIsoCode, countryIsoCode)
 
-        utils.injectCookie(
+        utils.injectCookies(
             driver=driver,
-            cookieValue=cookieValue,
-            cookieName=COUNTRY_AND_CURRENCY_COOKIE_NAME,
+            cookies={COUNTRY_AND_CURRENCY_COOKIE_NAME: cookieValue, **extraCookies},
+            domain=MAIN_COOKIE_DOMAIN,
             )
 
         # when changing country to usa the currency value is ignored and the
@@ -212,10 +314,10 @@ class Driver:
             # extra cookie for the us marketplace
             cookieValueUS = US_COUNTRY_AND_CURRENCY_COOKIE_VALUE.format(currencyIsoCode, countryIsoCode)
 
-            utils.injectCookie(
+            utils.injectCookies(
                 driver=driver,
-                cookieValue=cookieValueUS,
-                cookieName=COUNTRY_AND_CURRENCY_COOKIE_NAME,
+                cookies={COUNTRY_AND_CURRENCY_COOKIE_NAME: cookieValueUS, **extraCookies},
+                domain=US_COOKIE_DOMAIN,
                 )
 
     def setUpCountry (self, driver: ChromeWebdriver, country: str) -> str:
@@ -228,31 +330,23 @@ class Driver:
         :param country: country to set shipment to
         """
 
-        logging.info('Setting up the country...')
+        logger.info('Setting up the country...')
 
         country_dropdown_class = 'address-select-trigger'
 
-        # explicitly wait for the country list dropdown to load
-        try:
-            WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CLASS_NAME, country_dropdown_class))
-            )
-        except (NoSuchElementException, TimeoutException):
-            raise InvalidClassNameNavigationException(url=self.URL, className=country_dropdown_class, elementName='country list dropdown')
-
-        # click list once loaded
-        utils.getElement(
-            parent=driver,
+        # explicitly wait for the country list dropdown to load and click it
+        utils.waitForElement(
+            driver=driver,
             locatorMethod=By.CLASS_NAME,
             locatorValue=country_dropdown_class,
             url=self.URL,
             elementName='country list dropdown'
         ).click()
 
-        # get input element
+        # get input element once loaded
         input_class = 'filter-input'
-        inp = utils.getElement(
-            parent=driver,
+        inp = utils.waitForElement(
+            driver=driver,
             locatorMethod=By.CLASS_NAME,
             locatorValue=input_class,
             url=self.URL,
@@ -264,34 +358,17 @@ class Driver:
         inp.clear()
         inp.send_keys(country.lower())
 
-        # iterate over all list items and get the first one that is visible
-        result_class = 'address-select-item'
-        flagClass = ''
-
-        # iterate over all countries and click the first one that is not disabled
-        results = utils.getElements(
-            parent=driver,
-            locatorMethod=By.CLASS_NAME,
-            locatorValue=result_class,
-            url=self.URL,
-            elementName='country list element'
-        )
-
-        for result in results:
-            # check that it is a valid item by getting the 'data-name' attribute
-            if not result.get_attribute('data-name'):
-                continue
-
-            # get style to check display
-            style = result.get_attribute('style')
-            pattern = 'display: none'
+        # get the first valid country (one with a 'data-name') that is visible
+        # (the visibility check happens in the browser's selector engine)
+        result_selector = '.address-select-item[data-name]:not([data-name=""]):not([style*="display: none"])'
+        results = driver.find_elements(By.CSS_SELECTOR, result_selector)
+        if not results:
+            raise InvalidCountryException(country=country)
 
-            if not re.search(pattern, style):
-                # get flag class, click and end loop if visible
-                dataCode = result.get_attribute('data-code')
-                flagClass = f'css_{dataCode}'
-                result.click()
-                break
+        # get flag class and click
+        result = results[0]
+        flagClass = f'css_{utils.getAttribute(element=result, attribute="data-code")}'
+        result.click()
 
         return flagClass
 
@@ -305,19 +382,19 @@ class Driver:
         :param currency: currency to set shipment to (i.e. 'eur', 'USD', 'hKd')
         """
 
-        logging.info('Setting up the currency...')
+        logger.info('Setting up the currency...')
 
         currency_dropdown_class = 'select-item'
 
         # explicitly wait until the currency dropdown list is present
-        try:
-            WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CLASS_NAME, currency_dropdown_class))
-            )
-            driver.find_elements(By.CLASS_NAME, currency_dropdown_class)[1].click()
-        except (NoSuchElementException, TimeoutException) as e:
-            raise InvalidClassNameNavigationException(url=self.URL, className=currency_dropdown_class, elementName='currency list dropdown') \
-            from e
+        utils.waitForElement(
+            driver=driver,
+            locatorMethod=By.CLASS_NAME,
+            locatorValue=currency_dropdown_class,
+            url=self.URL,
+            elementName='currency list dropdown'
+        )
+        driver.find_elements(By.CLASS_NAME, currency_dropdown_class)[1].click()
 
         # click and insert in input
         input_class = 'search-currency'
@@ -335,7 +412,7 @@ class Driver:
         # iterate over all list items and get the first one that is visible
         currency_list_parent_class = 'switcher-currency-c'
         list_tag_name = 'ul'
-        result_xpath = './child::*'
+        result_selector = ':scope > *'
         currencyCode = ''
 
         # get parent element
@@ -357,23 +434,21 @@ class Driver:
         )
 
         # get results
-        results = utils.getElements(
-            parent=result_list,
-            locatorMethod=By.XPATH,
-            locatorValue=result_xpath,
-            url=self.URL,
-            elementName='currency list items'
-        )
+        # (find_elements returns an empty list instead of raising when there are no children)
+        results = result_list.find_elements(By.CSS_SELECTOR, result_selector)
         if not results:
             raise NoSuchElementException('List returned is empty.')
 
-        for result in results:
-            # get result's text to check if visible
-            if not result.text:
+        # read the text of all the results at once
+        texts = utils.getTexts(driver=driver, elements=results)
+
+        for result, text in zip(results, texts):
+            # check the result's text to check if visible
+            if not text:
                 continue
 
             # click the first visible result's link and break the loop
-            currencyCode = result.text[:3]
+            currencyCode = text[:3]
             result.click()
             break
 
@@ -389,8 +464,8 @@ class Driver:
         id = 'switcher-info'
 
         try:
-            utils.getElement(
-                parent=driver,
+            utils.waitForElement(
+                driver=driver,
                 locatorMethod=By.ID,
                 locatorValue=id,
                 url=self.URL,
@@ -410,8 +485,8 @@ class Driver:
 
         id = 'switcher-info'
 
-        utils.getElement(
-            parent=driver,
+        utils.waitForElement(
+            driver=driver,
             locatorMethod=By.ID,
             locatorValue=id,
             url=self.URL,
@@ -428,8 +503,8 @@ class Driver:
 
         className = 'ui-button'
 
-        utils.getElement(
-            parent=driver,
+        utils.waitForElement(
+            driver=driver,
             locatorMethod=By.CLASS_NAME,
             locatorValue=className,
             url=self.URL,
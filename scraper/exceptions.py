@@ -112,6 +112,29 @@ class InvalidTagNameNavigationException(Exception):
         super().__init__(self.message)
 
 
+class InvalidCssSelectorNavigationException(Exception):
+    """
+    Raised when there an element can't be found.
+    Raised only when we search for the element by css selector.
+
+    Attributes:
+        cssSelector : string of the css selector that the search was made with
+        elementName : optional name passed for the searched element
+    """
+    def __init__(self, cssSelector: str, url: str, message: str = None, elementName: str = None) -> None:
+
+        self.cssSelector = cssSelector
+        self.elementName = elementName
+        if not message:
+            message = f'Element with supposed css selector: {cssSelector}'
+            if elementName:
+                message += f' with the name of {elementName}'
+            message += f' cannot be found.\nURL: {url}'
+        self.message = message
+
+        super().__init__(self.message)
+
+
 class ItemPriceNotFoundException(Exception):
     """
     Raised when the Scraper can't find an item's price.
@@ -3,34 +3,37 @@
 """Scrape AliExpress."""
 
 # stdlib modules
-import os
 import re
 import sys
-import time
+import queue
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # third party modules
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 
 # inner modules
 from scraper import driver
 from scraper import scraperutils as utils
 
+# constants
+from scraper.const import SELECT_FIRST_OPTIONS_SCRIPT, PAGE_PROBE_SCRIPT, ITEM_PRICE_CLASSES, \
+SHIPPING_PRICE_CLASSES, TRACKING_OPTION_SCRIPT, THREE_DECIMAL_CURRENCIES
+
 # exceptions
 from scraper.exceptions import *
 from requests.exceptions import ConnectionError
-from selenium.common.exceptions import NoSuchElementException
-from selenium.common.exceptions import ElementNotInteractableException
-from selenium.common.exceptions import ElementClickInterceptedException
-from selenium.common.exceptions import TimeoutException
-from selenium.common.exceptions import JavascriptException
+from selenium.common.exceptions import WebDriverException
 
 # typing
-from typing import Tuple
+from typing import Tuple, Dict, Union, List
+
+logger = logging.getLogger(__name__)
+
+# the first run of digits and separators (a leading separator belongs to prices like .99)
+# digits may also be grouped in threes by (non-breaking) spaces (i.e. 1 234,56)
+PRICE_PATTERN = re.compile(r'[.,]?\d+(?:[ \u00a0\u202f]\d{3}(?!\d))*[\d.,]*')
+GROUPING_SPACES = str.maketrans('', '', ' \u00a0\u202f')
 
 class Scraper(driver.Driver):
     """
@@ -38,17 +41,97 @@ class Scraper(driver.Driver):
 
     Raises:
     scraper.exceptions.InvalidCountryException
+
+    :param loadTimeout: seconds to wait for an item page to load
+    :param clickTimeout: seconds to wait for a button to be clickable
+    :param listTimeout: seconds to wait for the shipping options list to open
     """
 
-    def __init__ (self, country: str, currency: str, headless: bool = True, debug: bool = False) -> None:
-        super().__init__(country, currency, headless, debug)
+    # default timeouts (seconds)
+    LOAD_TIMEOUT = 10
+    CLICK_TIMEOUT = 5
+    LIST_TIMEOUT = 3
+
+    def __init__ (self, *args, loadTimeout: float = None, clickTimeout: float = None, listTimeout: float = None, **kwargs) -> None:
+        # override the default timeouts only for this instance
+        if loadTimeout is not None:
+            self.LOAD_TIMEOUT = loadTimeout
+        if clickTimeout is not None:
+            self.CLICK_TIMEOUT = clickTimeout
+        if listTimeout is not None:
+            self.LIST_TIMEOUT = listTimeout
+
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def scrapeURLs (cls, urls: List[str], trackings: List[bool], country: str, currency: str, headless: bool = True, workers: int = 4, reuse: bool = False) -> List[Union[Tuple[float, float], Exception]]:
+        """
+        Scrapes the given AliExpress urls concurrently using a pool of Scrapers,
+        each one with its own driver, and closes them once done.
+        (if reusing, the drivers are returned to the driver pool instead)
+        Returns the (item price, shipping price) of each url in the same order as the urls.
+        If scraping a url raised an exception, the exception is returned in its place.
+
+        :param urls: item page urls
+        :param trackings: whether or not to get the cheapest tracking option in shipping for each url
+        :param country: country to ship to
+        :param currency: currency to show prices as
+        :param headless: whether the drivers should be headless
+        :param workers: number of Scrapers (and drivers) to scrape with
+        :param reuse: whether to reuse idle drivers from previous runs and keep the drivers open for later runs
+        """
+
+        # every url needs its tracking, otherwise the results wouldn't line up with the urls
+        if len(urls) != len(trackings):
+            raise ValueError(f'Got {len(urls)} urls but {len(trackings)} trackings.')
+
+        if not urls:
+            return []
+
+        workers = min(workers, len(urls))
+
+        # every task borrows a free scraper and gives it back once done
+        pool = queue.Queue()
+
+        def scrape (url: str, tracking: bool) -> Tuple[float, float]:
+            scraper = pool.get()
+            try:
+                return scraper.scrapeURL(url, tracking)
+            finally:
+                pool.put(scraper)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # set up all the scrapers concurrently
+            setUps = [executor.submit(cls, country, currency, headless, reuse=reuse) for _ in range(workers)]
+            scrapers = [setUp.result() for setUp in setUps if not setUp.exception()]
+
+            try:
+                # there is no point in going on if any scraper failed to be set up
+                for setUp in setUps:
+                    if setUp.exception():
+                        raise setUp.exception()
+
+                for scraper in scrapers:
+                    pool.put(scraper)
+
+                futures = [executor.submit(scrape, url, tracking) for url, tracking in zip(urls, trackings)]
 
-        # a variable used to count the retries done for scraping url
-        self.retryCount = 0
+                results = []
+                for future in futures:
+                    error = future.exception()
+                    results.append(error if error else future.result())
+
+            finally:
+                for scraper in scrapers:
+                    scraper.close()
+
+        return results
 
     def scrapeURL (self, url: str, tracking: bool) -> Tuple[float, float]:
         """
         Scrapes the given AliExpress url for the item price and the shipping price.
+        Resets the driver and retries up to self.RETRIES times on connection errors.
+        (soft resets first and restarts the browser at most once, only if that didn't help)
 
         :param url: item page url
         :param tracking: whether or not to get the cheapest tracking option in shipping
@@ -56,123 +139,120 @@ class Scraper(driver.Driver):
 
         url = self.sanitizeURL(url)
 
-        logging.info(f'Now scraping: {url}')
-        try:
+        logger.info('Now scraping: %s', url)
 
-            self.current_url = url
-            self.driver.get(url)
+        # the browser is restarted at most once per url
+        didFullReset = False
 
-            # initialy check that the product page is not deleted
-            if not self.checkPageAvailability():
-                return (0, 0)
+        for retry in range(self.RETRIES + 1):
+            try:
+                return self.scrapePage(url, tracking)
+            except ConnectionError as e:
+                if retry >= self.RETRIES:
+                    logger.error('Retried %s times. Error occured at last try: %s', retry, e)
+                    raise e
+
+                # restart the browser only if a soft reset didn't help
+                if retry > 0 and not didFullReset:
+                    logger.error('There was an error in the connection again. Resetting driver and retrying...')
+                    self.resetDriver()
+                    didFullReset = True
+                    continue
+
+                logger.error('There was an error in the connection. Soft resetting driver and retrying...')
+                try:
+                    self.softReset()
+                except (ConnectionError, WebDriverException) as resetError:
+                    if didFullReset:
+                        logger.error('Soft reset failed after the driver was already reset: %s', resetError)
+                        raise resetError from e
+
+                    self.resetDriver()
+                    didFullReset = True
+
+    def scrapePage (self, url: str, tracking: bool) -> Tuple[float, float]:
+        """
+        Opens the given (sanitized) AliExpress url and scrapes it for the item price and the shipping price.
 
-            # check that the product is available to be sent at the requested country
-            if not self.checkAvailability():
-                return (0, 0)
+        :param url: item page url
+        :param tracking: whether or not to get the cheapest tracking option in shipping
+        """
 
-            # accept cookies so that they don't intercept in later clicks
-            utils.acceptCookies(self.driver)
+        self.current_url = url
+        self.driver.get(url)
 
-            # select all first options (color, size etc.)
-            self.selectFirstOptions(url)
+        # check the page and the item's availability in a single call
+        probe = self.probePage()
 
-            # get item price
-            itemPrice = self.getItemPrice()
-            logging.info(f'Got item price: {itemPrice}')
+        if probe['status'] == 'timeout':
+            raise InvalidClassNameNavigationException(className='dynamic-shipping', elementName='shipping availability element', url=url)
 
-            # get the shipping price string
-            # firstly validate that tracking is available if tracking is true
-            if tracking:
-                self.setShippingTracking()
-            shippingPriceString = self.getShippingPriceString().replace(',', '.')
-            if re.search('Free Shipping', shippingPriceString):
-                shippingPrice = 0
-            else:
-                shippingPrice = self.convertPriceToFloat(shippingPriceString)
-            logging.info(f'Got item shipping price: {shippingPrice}')
-        except ConnectionError as e:
-            if self.retryCount >= self.RETRIES:
-                logging.error(f'Retried {self.retryCount} times. Error occured at last try: {e}')
+        if probe['status'] != 'available':
+            logger.info('Item is unavailable (%s).', probe['status'])
+            return (0, 0)
 
-            logging.error(f'There was an error in the connection. Resetting driver and retrying...')
-            self.retryCount += 1
-            self.resetDriver()
-            return self.scrapeURL(url, tracking)
+        if probe['propertyCount'] or tracking or not (probe['itemText'] and probe['shippingText']):
+            itemPrice, shippingPrice = self.scrapePrices(url, tracking)
+        else:
+            # there is nothing to select so the prices read by the probe are final
+            itemPrice = self.convertPriceToFloat(probe['itemText'])
+            shippingPrice = self.convertShippingPriceToFloat(probe['shippingText'])
 
-        # reset retry count if successful
-        self.retryCount = 0
+        logger.info('Got item price: %s', itemPrice)
+        logger.info('Got item shipping price: %s', shippingPrice)
 
         return (itemPrice, shippingPrice)
 
-    def checkPageAvailability (self) -> bool:
-        """
-        Returns true if the product page is not removed.
+    def scrapePrices (self, url: str, tracking: bool) -> Tuple[float, float]:
         """
+        Selects the item's options (and shipping option) and scrapes the item price and the shipping price.
+        Assumes that driver is already at an available item's page.
 
-        logging.info('Checking product page...')
+        :param url: needed for error messages
+        :param tracking: whether or not to get the cheapest tracking option in shipping
+        """
 
-        className = 'not-found-page'
-        try:
-            self.driver.find_element(By.CLASS_NAME, className)
-            logging.info('Product page unavailable.')
-            return False
-        except NoSuchElementException:
-            return True
-        except Exception as e:
-            raise e
+        # accept cookies so that they don't intercept in later clicks
+        utils.acceptCookies(self.driver)
 
-    def checkAvailability (self) -> bool:
-        """
-        Returns true if product is available.
-        """
+        # select all first options (color, size etc.)
+        self.selectFirstOptions(url)
 
-        logging.info('Checking item availability...')
+        # get item price
+        itemPrice = self.getItemPrice()
 
-        # there are two levels of availability that we need to check
+        # get the shipping price string
+        # firstly validate that tracking is available if tracking is true
+        if tracking:
+            self.setShippingTracking()
+        shippingPrice = self.convertShippingPriceToFloat(self.getShippingPriceString())
 
-        # first level: the item is at all available
+        return (itemPrice, shippingPrice)
 
-        # if this element exists then the item is not at all available
-        try:
-            unavailability_class = 'customs-message-wrap'
-            utils.getElement(
-                parent=self.driver,
-                locatorMethod=By.CLASS_NAME,
-                locatorValue=unavailability_class,
-                url=self.current_url,
-                elementName='"item unavailable" message'
-            )
+    def probePage (self, timeout: float = None) -> Dict[str, Union[str, int]]:
+        """
+        Waits inside the browser until the availability of the item page can be determined.
+        Returns a dict with the page's 'status' ('removed', 'unavailable', 'unreachable',
+        'available' or 'timeout'), its 'propertyCount' and its current 'itemText' and 'shippingText'.
+        Assumes that driver is already at an item's page.
 
-            logging.info('Item is unavailable.')
+        :param timeout: seconds to wait for the page to load (defaults to self.LOAD_TIMEOUT)
+        """
 
-            return False
+        if timeout is None:
+            timeout = self.LOAD_TIMEOUT
 
-        except InvalidClassNameNavigationException:
-            pass
+        logger.info('Checking product page and item availability...')
 
-        # second level: the item is available to be shipped
+        # leave some room for the script to report the timeout itself
+        self.driver.set_script_timeout(timeout + 2)
 
-        # make sure that parent element is loaded
-        # (parent element is present no matter the item's availability)
-        parentClassName = 'dynamic-shipping'
-        try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, parentClassName))
-            )
-        except (NoSuchElementException, TimeoutException) as e:
-            raise InvalidClassNameNavigationException(className=parentClassName, elementName='shipping availability element', url=self.current_url) \
-            from e
-
-        # try to find element present when item is not available
-        className = 'dynamic-shipping-unreachable'
-        try:
-            self.driver.find_element(By.CLASS_NAME, className)
-            logging.info('Item is unavailable.')
-            return False
-        except NoSuchElementException:
-            return True
-        except Exception as e:
-            raise e
+        return self.driver.execute_async_script(
+            PAGE_PROBE_SCRIPT,
+            timeout * 1000,
+            ITEM_PRICE_CLASSES,
+            SHIPPING_PRICE_CLASSES,
+        )
 
     def selectFirstOptions (self, url: str) -> None:
         """
@@ -182,50 +262,22 @@ class Scraper(driver.Driver):
         :param url: needed for error messages
         """
 
-        logging.info('Selecting the first option for all available properties...')
-
-        className = 'sku-property-list'
-        try:
-            lists = self.driver.find_elements(By.CLASS_NAME, className)
-            for list in lists:
-                # select first available option
-
-                # get options
-                option_class = 'sku-property-item'
-                options = utils.getElements(
-                    parent=list,
-                    locatorMethod=By.CLASS_NAME,
-                    locatorValue=option_class,
-                    url=self.current_url,
-                    elementName='property options'
-                )
-                for option in options:
-                    if not 'disabled' in option.get_attribute('class'):
-                        option.click()
-                        break
-
-                logo_class = 'logo-base'
-                logo = utils.getElement(
-                    parent=self.driver,
-                    locatorMethod=By.CLASS_NAME,
-                    locatorValue=logo_class,
-                    url=self.current_url,
-                    elementName='logo'
-                )
-
-                # move mouse away from options because sometimes there are
-                # tooltips that intercept clicking them
-                actionChain = ActionChains(self.driver)
-                actionChain.move_to_element(logo).perform()
-
-                # explicitly wait for the more options button to reload
-                self.waitMoreOptionsButton()
-                # the more options button updates everytime an option is selected
-                # and it always finishes loading after the price has been updated
-                # if it needs to, so it is the perfect wait time after a click
-
-        except NoSuchElementException:
+        logger.info('Selecting the first option for all available properties...')
+
+        # click the first available option of every property list in a single call
+        chosen = self.driver.execute_script(SELECT_FIRST_OPTIONS_SCRIPT)
+
+        if not chosen:
             sys.stderr.write(f'No properties found at {url}\n')
+            return
+
+        logger.info('Selected options %s for %s properties.', chosen, len(chosen))
+
+        # explicitly wait for the more options button to reload
+        # the more options button updates everytime an option is selected
+        # and it always finishes loading after the price has been updated
+        # if it needs to, so it is the perfect wait time after the clicks
+        self.waitMoreOptionsButton()
 
     def waitMoreOptionsButton (self) -> None:
         """
@@ -233,19 +285,20 @@ class Scraper(driver.Driver):
         """
 
         buttonClassName = 'comet-btn'
-        try:
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.CLASS_NAME, buttonClassName))
-            )
-        except (NoSuchElementException, TimeoutException) as e:
-            raise InvalidClassNameNavigationException(url=self.current_url, className=buttonClassName, elementName='shipping options button') \
-            from e
+        utils.waitForElement(
+            driver=self.driver,
+            locatorMethod=By.CLASS_NAME,
+            locatorValue=buttonClassName,
+            url=self.current_url,
+            elementName='shipping options button',
+            timeout=self.CLICK_TIMEOUT,
+        )
 
     def getItemPrice (self) -> float:
         """
         Wraps the getItemPriceString.
         """
-        return self.convertPriceToFloat(self.getItemPriceString().replace(',', '.'))
+        return self.convertPriceToFloat(self.getItemPriceString())
 
     def getItemPriceString (self) -> str:
         """
@@ -255,20 +308,10 @@ class Scraper(driver.Driver):
         Raises ItemPriceNotFoundException if string itemPriceString is empty.
         """
 
-        possible_classes = [
-            'uniform-banner-box-price',
-            'product-price-value',
-        ]
-
-        itemPriceString = ''
+        possible_classes = ITEM_PRICE_CLASSES
 
-        for className in possible_classes:
-            try:
-                price_elem = self.driver.find_element(By.CLASS_NAME, className)
-                itemPriceString = price_elem.text
-                break
-            except NoSuchElementException:
-                sys.stderr.write(f'No element with class {className}, trying next one...\n')
+        # try all the classes in a single call
+        itemPriceString = utils.getTextByClassNames(driver=self.driver, classNames=possible_classes)
 
         if not itemPriceString:
             raise ItemPriceNotFoundException(url=self.current_url, classes=possible_classes)
@@ -283,19 +326,10 @@ class Scraper(driver.Driver):
         Raises ShippingPriceNotFoundException if string to be returned is empty.
         """
 
-        possible_classes = [
-            'dynamic-shipping',
-        ]
+        possible_classes = SHIPPING_PRICE_CLASSES
 
-        shippingPriceString = ''
-
-        for className in possible_classes:
-            try:
-                price_elem = self.driver.find_element(By.CLASS_NAME, className)
-                shippingPriceString = price_elem.text
-                break
-            except NoSuchElementException:
-                sys.stderr.write(f'No element with class {className}, trying next one...\n')
+        # try all the classes in a single call
+        shippingPriceString = utils.getTextByClassNames(driver=self.driver, classNames=possible_classes)
 
         if not shippingPriceString:
             raise ShippingPriceNotFoundException(url=self.current_url, classes=possible_classes)
@@ -307,78 +341,102 @@ class Scraper(driver.Driver):
         Sets the shipping option to the cheapest tracking option.
         """
 
-        logging.info('Setting shipping to the cheapest option with tracking available...')
+        logger.info('Setting shipping to the cheapest option with tracking available...')
 
-        # explicitly wait until the page is loaded
-        # by checking whether the button for more shipping options is loaded
+        driver = self.driver
+        findElements = driver.find_elements
+
+        # the button for more shipping options is usually already loaded
+        # (selectFirstOptions waits for it) so only wait for it if it's missing
         buttonClassName = 'comet-btn'
-        try:
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.CLASS_NAME, buttonClassName))
+        buttons = findElements(By.CLASS_NAME, buttonClassName)
+        if buttons:
+            elem = buttons[0]
+        else:
+            elem = utils.waitForElement(
+                driver=driver,
+                locatorMethod=By.CLASS_NAME,
+                locatorValue=buttonClassName,
+                url=self.current_url,
+                elementName='shipping options button',
+                timeout=self.CLICK_TIMEOUT,
             )
-        except (NoSuchElementException, TimeoutException) as e:
-            raise InvalidClassNameNavigationException(url=self.current_url, className=buttonClassName, elementName='shipping options button') \
-            from e
-
 
         # press button to open shipping options
-        elem = utils.getElement(
-            parent=self.driver,
-            locatorMethod=By.CLASS_NAME,
-            locatorValue=buttonClassName,
-            url=self.current_url,
-            elementName='shipping options button'
-        )
         elem.click()
 
         # explicitly wait for the list to open by checking for list elements
         listElementClass = 'dynamic-shipping-mark'
-        try:
-            WebDriverWait(self.driver, 3).until(
-                EC.presence_of_element_located((By.CLASS_NAME, listElementClass))
-            )
-        except (NoSuchElementException, TimeoutException) as e:
-            raise InvalidClassNameNavigationException(url=self.current_url, className=listElementClass, elementName='shipping options list element') \
-            from e
+        utils.waitForElement(
+            driver=driver,
+            locatorMethod=By.CLASS_NAME,
+            locatorValue=listElementClass,
+            url=self.current_url,
+            elementName='shipping options list element',
+            timeout=self.LIST_TIMEOUT,
+        )
 
         # press button for more options if available
-        try:
-            elems = self.driver.find_elements(By.CLASS_NAME, buttonClassName)
-            if len(elems) > 1:
-                elems[1].click()
-        except NoSuchElementException:
+        # (the buttons have to be fetched again since the list has been opened)
+        buttons = findElements(By.CLASS_NAME, buttonClassName)
+        if len(buttons) > 1:
+            buttons[1].click()
+        else:
             sys.stderr.write('No "More options" button.\n')
 
-        # get first element with tracking available (already sorted from cheapest to most expensive)
-        trackingClassName = 'dynamic-shipping-mark'
-        shippingOptions = utils.getElements(
-            parent=self.driver,
-            locatorMethod=By.CLASS_NAME,
-            locatorValue=trackingClassName,
-            url=self.current_url,
-            elementName='shipping options list element'
-        )
+        # find the first option with tracking available inside the browser
+        # (options are already sorted from cheapest to most expensive)
+        # if there are no tracking available options the first option is clicked to close the list
+        option = driver.execute_script(TRACKING_OPTION_SCRIPT, listElementClass)
+        if not option:
+            raise InvalidClassNameNavigationException(url=self.current_url, className=listElementClass, elementName='shipping options list element')
 
-        found = False
-        for option in shippingOptions:
-            if option.text == 'Tracking Available':
-                found = True
-                option.click()
-                break
+        option.click()
 
-        # there are no tracking available options so just click the first option to close the list
-        if not found:
-            shippingOptions[0].click()
+    def convertShippingPriceToFloat (self, price: str) -> float:
+        """
+        Converts a string with a shipping price to a float value. (0 for free shipping)
+
+        :param price: the shipping price string
+        """
+
+        # the casing of the label differs between page layouts
+        if 'free shipping' in price.lower():
+            return 0
+
+        return self.convertPriceToFloat(price)
 
     def convertPriceToFloat (self, price: str) -> float:
         """
         Converts a string with a price to a float value. (the price)
+        Both commas and dots are accepted as separators and digits may be grouped by spaces.
+        When both separators are present the last one is the decimal separator.
+        A lone separator followed by exactly three digits (i.e. 12,000) is a thousands separator,
+        unless the scraper's currency has three decimal places (i.e. KWD 1.234).
 
         :param price: the price string
         """
 
-        pattern = '([\d.,]+)'
-        return float(re.search(pattern, price).groups()[0])
+        match = PRICE_PATTERN.search(price)
+        if not match:
+            raise ValueError(f'No price found in {price!r}.')
+        number = match.group().translate(GROUPING_SPACES).rstrip('.,')
+
+        currency = (self.currency or '')[:3].upper()
+
+        whole, decimal = number, ''
+        last = max(number.rfind('.'), number.rfind(','))
+        if last >= 0:
+            separator = number[last]
+            other = ',' if separator == '.' else '.'
+            lone = number.count(separator) == 1
+            # a repeated separator only groups thousands and so does a lone one
+            # followed by three digits, unless the currency has three decimals
+            if other in number or (lone and (len(number) - last - 1 != 3 or currency in THREE_DECIMAL_CURRENCIES)):
+                whole, decimal = number[:last], number[last + 1:]
+
+        whole = whole.replace('.', '').replace(',', '')
+        return float(f'{whole}.{decimal}' if decimal else whole)
 
     def sanitizeURL (self, url: str) -> str:
         """
@@ -387,8 +445,4 @@ class Scraper(driver.Driver):
         :param url: url to sanitize
         """
 
-        index = url.find('?')
-        if index >= 0:
-            return url[:index]
-
-        return url
+        return url.partition('?')[0]
@@ -4,30 +4,20 @@
 
 # stdlib modules
 import os
-import re
-import sys
-import time
 import logging
-import platform
 
 # third party modules
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # exceptions
 from scraper.exceptions import *
 from selenium.common.exceptions import NoSuchElementException
-from selenium.common.exceptions import ElementNotInteractableException
-from selenium.common.exceptions import ElementClickInterceptedException
-from selenium.common.exceptions import TimeoutException
 from selenium.common.exceptions import NoSuchAttributeException
+from selenium.common.exceptions import TimeoutException
 
 # typing
-from typing import Union, Tuple
+from typing import Union, Tuple, List, Dict
 
 # typedef
 ChromeWebdriver: webdriver.chrome.webdriver.WebDriver
@@ -35,6 +25,49 @@ ChromeWebdriver = webdriver.chrome.webdriver.WebDriver
 WebElement: webdriver.remote.webelement.WebElement
 WebElement = webdriver.remote.webelement.WebElement
 
+logger = logging.getLogger(__name__)
+
+# default file to write page sources to when debugging
+DEBUG_HTML_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'driver_debug.html')
+
+# exception raised and the name of its locator value argument for every locator method
+NAVIGATION_EXCEPTIONS = {
+    By.XPATH : (InvalidXpathNavigationException, 'xpath'),
+    By.CLASS_NAME : (InvalidClassNameNavigationException, 'className'),
+    By.ID : (InvalidIdNavigationException, 'id'),
+    By.TAG_NAME : (InvalidTagNameNavigationException, 'tagName'),
+    By.CSS_SELECTOR : (InvalidCssSelectorNavigationException, 'cssSelector'),
+}
+
+# defines locate(locatorMethod, locatorValue) that returns the first element found the same way
+# as driver.find_element (or null) for scripts that need to locate elements inside the browser
+LOCATE_ELEMENT_SCRIPT = '''
+const locate = (locatorMethod, locatorValue) => {
+    switch (locatorMethod) {
+        case 'xpath': return document.evaluate(locatorValue, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'class name': return document.getElementsByClassName(locatorValue)[0];
+        case 'id': return document.getElementById(locatorValue);
+        case 'tag name': return document.getElementsByTagName(locatorValue)[0];
+        case 'css selector': return document.querySelector(locatorValue);
+    }
+    return null;
+};
+'''
+
+def navigationException (locatorMethod: str, locatorValue: str, url: str, elementName: str = None) -> Exception:
+    """
+    Returns the appropriate exception for an element that could not be found.
+
+    :param locatorMethod: method the element was located with, should be value of selenium By
+    :param locatorValue: value the element was located with
+    :param url: current page's url
+    :param elementName: target element's name in logging
+    """
+
+    exception, valueName = NAVIGATION_EXCEPTIONS[locatorMethod]
+
+    return exception(url=url, elementName=elementName, **{valueName: locatorValue})
+
 def getElement (parent: Union[ChromeWebdriver, WebElement], locatorMethod: str, locatorValue: str, url: str, elementName: str = None) -> WebElement:
     """
     Returns a webdriver WebElement.
@@ -54,20 +87,15 @@ def getElement (parent: Union[ChromeWebdriver, WebElement], locatorMethod: str,
         elem = parent.find_element(locatorMethod, locatorValue)
     except NoSuchElementException as e:
         # raise appropriate exception if element not found
-        exceptions = {
-            By.XPATH : InvalidXpathNavigationException(url=url, xpath=locatorValue, elementName=elementName),
-            By.CLASS_NAME : InvalidClassNameNavigationException(url=url, className=locatorValue, elementName=elementName),
-            By.ID : InvalidIdNavigationException(url=url, id=locatorValue, elementName=elementName),
-            By.TAG_NAME : InvalidTagNameNavigationException(url=url, tagName=locatorValue, elementName=elementName),
-        }
-        raise exceptions[locatorMethod] from e
+        raise navigationException(locatorMethod, locatorValue, url, elementName) from e
 
     return elem
 
 def getElements (parent: Union[ChromeWebdriver, WebElement], locatorMethod: str, locatorValue: str, url: str, elementName: str = None) -> List[WebElement]:
     """
     Returns a list of webdriver WebElements.
-    Locates it by the locatorMethod with the locatorValue.
+    Locates them by the locatorMethod with the locatorValue.
+    Raises the appropriate navigation exception if there are no such elements.
     (i.e. locatorMethod = By.XPATH, locatorValue="./child::*")
 
     :param parent: chromewebdriver or parent element to search for the elements
@@ -77,21 +105,65 @@ def getElements (parent: Union[ChromeWebdriver, WebElement], locatorMethod: str,
     :param elementName: target elements' name in logging
     """
 
-    elems = []
+    # find_elements never raises when there are no elements, it returns an empty list
+    elems = parent.find_elements(locatorMethod, locatorValue)
+    if not elems:
+        raise navigationException(locatorMethod, locatorValue, url, elementName)
 
-    try:
-        elems = parent.find_elements(locatorMethod, locatorValue)
-    except NoSuchElementException as e:
-        # raise appropriate exception if element not found
-        exceptions = {
-            By.XPATH : InvalidXpathNavigationException(url=url, xpath=locatorValue, elementName=elementName),
-            By.CLASS_NAME : InvalidClassNameNavigationException(url=url, className=locatorValue, elementName=elementName),
-            By.ID : InvalidIdNavigationException(url=url, id=locatorValue, elementName=elementName),
-            By.TAG_NAME : InvalidTagNameNavigationException(url=url, tagName=locatorValue, elementName=elementName),
+    return elems
+
+def waitForElement (driver: ChromeWebdriver, locatorMethod: str, locatorValue: str, url: str, elementName: str = None, timeout: float = 3) -> WebElement:
+    """
+    Explicitly waits until a webdriver WebElement is present and returns it.
+    Locates it by the locatorMethod with the locatorValue.
+    (i.e. locatorMethod = By.CLASS_NAME, locatorValue="comet-btn")
+    The wait happens inside the browser, so it returns as soon as the element is added to the page.
+
+    :param driver: chromewebdriver to wait on
+    :param locatorMethod: method to locate the element, should be By.XPATH, By.CLASS_NAME, By.ID, By.TAG_NAME or By.CSS_SELECTOR
+    :param locatorValue: value to locate the element corresponding to the locatorMethod
+    :param url: current page's url - required for better error logging
+    :param elementName: target element's name in logging
+    :param timeout: seconds to wait for the element before giving up
+    """
+
+    script = LOCATE_ELEMENT_SCRIPT + '''
+    const [locatorMethod, locatorValue, timeout, done] = arguments;
+    const find = () => locate(locatorMethod, locatorValue);
+
+    const elem = find();
+    if (elem) return done(elem);
+
+    const observer = new MutationObserver(() => {
+        const elem = find();
+        if (elem) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(elem);
         }
-        raise exceptions[locatorMethod] from e
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        done(null);
+    }, timeout);
+    observer.observe(document, {childList: true, subtree: true});
+    '''
 
-    return elems
+    elem = None
+
+    # leave some room for the script to report the timeout itself
+    driver.set_script_timeout(timeout + 2)
+
+    try:
+        elem = driver.execute_async_script(script, locatorMethod, locatorValue, timeout * 1000)
+    except TimeoutException:
+        pass
+
+    if elem is None:
+        # raise appropriate exception if element not found in time
+        raise navigationException(locatorMethod, locatorValue, url, elementName)
+
+    return elem
 
 def getAttribute (element: WebElement, attribute: str) -> Union[str, None]:
     """
@@ -111,40 +183,86 @@ def getAttribute (element: WebElement, attribute: str) -> Union[str, None]:
 
     return attr
 
-def savePageSource (driver: ChromeWebdriver, filepath: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'driver_debug.html')) -> None:
+def getTexts (driver: ChromeWebdriver, elements: List[WebElement]) -> List[str]:
+    """
+    Returns the visible text of each of the passed elements.
+    All texts are read in a single call to the driver instead of one call per element.
+
+    :param driver: driver that the elements belong to
+    :param elements: elements to get the text of
+    """
+
+    if not elements:
+        return []
+
+    return driver.execute_script('return arguments[0].map(e => e.innerText);', elements)
+
+def getTextByClassNames (driver: ChromeWebdriver, classNames: List[str]) -> str:
+    """
+    Returns the text of the first element that has any of the passed class names
+    (tried in order) and some visible text.
+    Returns an empty string if there is no such element.
+    All class names are tried in a single call to the driver.
+
+    :param driver: driver with currently open page to search in
+    :param classNames: class names to try, in order of preference
+    """
+
+    script = '''
+    for (const className of arguments[0]) {
+        const elem = document.getElementsByClassName(className)[0];
+        if (elem && elem.innerText) return elem.innerText;
+    }
+    return '';
+    '''
+
+    return driver.execute_script(script, classNames)
+
+def savePageSource (driver: ChromeWebdriver, filepath: str = DEBUG_HTML_PATH) -> None:
     """
     Writes the page source of the page currently
     open in the driver to the specified file.
 
     :param driver: driver with currently open page that we need the page source
-    :param filepath: path to file to write page source to, defaults to debug.html in tests
+    :param filepath: path to file to write page source to, defaults to driver_debug.html in tests
     """
 
-    logging.info(f'Writing page source in {filepath}')
+    logger.info('Writing page source in %s', filepath)
 
-    with open(filepath, 'w', encoding='utf-8') as file:
-        file.write(driver.page_source)
+    # encode once and write the bytes as they are
+    data = driver.page_source.encode('utf-8', 'surrogatepass')
+    with open(filepath, 'wb') as file:
+        file.write(data)
 
-def injectCookie (driver: ChromeWebdriver, cookieValue: str, cookieName: str) -> None:
+def injectCookie (driver: ChromeWebdriver, cookieValue: str, cookieName: str, domain: str) -> None:
     """
-    Injects cookie with name cookieName and value cookieValue
-    into the current page open in the driver.
-    If there is a cookie with the same name already it will
-    replace that cookie using the original cookie's attributes.
-    (i.e. expiry date)
+    Injects cookie with name cookieName and value cookieValue for the passed domain.
+    A single cookie version of injectCookies, an existing cookie with the same name is replaced.
 
+    :param driver: driver to inject the cookie to
     :param cookieValue: value of the cookie to be injected
     :param cookieName: name of the cookie to be injected
+    :param domain: domain of the cookie (i.e. '.aliexpress.com')
     """
 
-    cookie = driver.get_cookie(cookieName)
-    if not cookie:
-        cookie = {}
+    injectCookies(driver, {cookieName: cookieValue}, domain)
 
-    cookie['name'] = cookieName
-    cookie['value'] = cookieValue
+def injectCookies (driver: ChromeWebdriver, cookies: Dict[str, str], domain: str) -> None:
+    """
+    Injects all the passed cookies for the passed domain in a single call to the driver.
+    Existing cookies with the same names are replaced without keeping their attributes.
+
+    :param driver: driver to inject the cookies to
+    :param cookies: names and values of the cookies to be injected
+    :param domain: domain of the cookies (i.e. '.aliexpress.com')
+    """
 
-    driver.add_cookie(cookie)
+    driver.execute_cdp_cmd('Network.setCookies', {
+        'cookies': [
+            {'name': name, 'value': value, 'domain': domain, 'path': '/'}
+            for name, value in cookies.items()
+        ],
+    })
 
 def acceptCookies (driver: ChromeWebdriver, persist: bool = False) -> None:
     """
@@ -154,35 +272,28 @@ def acceptCookies (driver: ChromeWebdriver, persist: bool = False) -> None:
     :param persit: set to True to throw an exception if a cookie banner is not found
     """
 
-    logging.info('Closing cookie banner...')
+    logger.info('Closing cookie banner...')
 
     cookieBannerClassName = 'global-gdpr-container'
     acceptButtonClassName = 'btn-accept'
 
-    try:
-        cookieBanner = getElement(
-            parent=driver,
-            locatorMethod=By.CLASS_NAME,
-            locatorValue=cookieBannerClassName,
-            url=driver.current_url,
-            elementName='global cookie banner'
-        )
-    except InvalidClassNameNavigationException as e:
-        if persist:
-            raise e
-        else:
-            # no reason to keep going if there is no cookie banner
-            return
-
-    acceptButton = getElement(
-        parent=cookieBanner,
-        locatorMethod=By.CLASS_NAME,
-        locatorValue=acceptButtonClassName,
-        url=driver.current_url,
-        elementName='cookie banner accept button'
-    )
-
-    acceptButton.click()
+    # find the banner and click its accept button in a single call
+    script = '''
+    const banner = document.getElementsByClassName(arguments[0])[0];
+    if (!banner) return 'no banner';
+    const button = banner.getElementsByClassName(arguments[1])[0];
+    if (!button) return 'no button';
+    button.click();
+    return 'clicked';
+    '''
+    result = driver.execute_script(script, cookieBannerClassName, acceptButtonClassName)
+
+    # no reason to raise if there is no cookie banner unless asked to
+    if result == 'no banner' and persist:
+        raise navigationException(By.CLASS_NAME, cookieBannerClassName, driver.current_url, 'global cookie banner')
+
+    if result == 'no button':
+        raise navigationException(By.CLASS_NAME, acceptButtonClassName, driver.current_url, 'cookie banner accept button')
 
 class text_to_be_present_in_child_element_attribute (object):
     """
@@ -201,9 +312,12 @@ class text_to_be_present_in_child_element_attribute (object):
         self.text = text
 
     def __call__ (self, driver) -> Union[bool, WebElement]:
-        parent = driver.find_element(*self.locator)
-        child = parent.find_element(By.XPATH, './child::*')
-        if self.text in child.get_attribute(self.attribute):
-            return child
-        else:
-            return False
+        # find the child and check its attribute inside the browser in a single call
+        script = LOCATE_ELEMENT_SCRIPT + '''
+        const [locatorMethod, locatorValue, attribute, text] = arguments;
+        const parent = locate(locatorMethod, locatorValue);
+        const child = parent && parent.firstElementChild;
+        return child && (child.getAttribute(attribute) || '').includes(text) ? child : null;
+        '''
+
+        return driver.execute_script(script, *self.locator, self.attribute, self.text) or False
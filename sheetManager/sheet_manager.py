@@ -7,110 +7,112 @@ import os
 
 # third party modules
 import gspread
+from requests.adapters import HTTPAdapter
 
 # typing
 from typing import List, Tuple, Dict, Union
 
+# tracking cell values that mean no tracking (i.e. an unchecked checkbox reads 'FALSE')
+FALSE_VALUES = ('', 'false', 'no', '0')
+
+# the service account is authorized once and every opened worksheet is kept by url
+# so that creating more SheetManagers doesn't authorize or open the same sheet again
+SERVICE_ACCOUNT: Union[gspread.Client, None]
+SERVICE_ACCOUNT = None
+WORKSHEETS: Dict[str, gspread.Worksheet]
+WORKSHEETS = {}
+
 class SheetManager:
     """
     Can read and write in a particular sheet.
 
     :param url: google sheet url
     """
-    def __init__ (self, url: str) -> None:
-        self.service_account = gspread.service_account(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'credentials.json')
-        )
-        self.worksheet = self.service_account.open_by_url(url).sheet1
 
-    def getItemUrls (self) -> List[str]:
-        """
-        Returns a list with the item urls from the worksheet in the predetermined format.
-        Skips items that already have an item price.
-        """
+    # number of buffered writes that triggers a flush
+    WRITE_BATCH_SIZE = 20
 
-        # get all urls
-        urls: List[str]
-        all_urls = self.worksheet.col_values(1)[3:]
+    def __init__ (self, url: str) -> None:
+        global SERVICE_ACCOUNT
 
-        # get all item prices
-        prices: List[str]
-        prices = self.worksheet.col_values(3)[3:]
+        if SERVICE_ACCOUNT is None:
+            SERVICE_ACCOUNT = gspread.service_account(
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'credentials.json')
+            )
+            # keep connections to the API open between requests and retry failed connections
+            SERVICE_ACCOUNT.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=3))
+        self.service_account = SERVICE_ACCOUNT
 
-        urls = [url for url, price in zip(all_urls, prices) if not price]
-        urls.extend(all_urls[len(prices):])
+        if url not in WORKSHEETS:
+            WORKSHEETS[url] = self.service_account.open_by_url(url).sheet1
+        self.worksheet = WORKSHEETS[url]
 
-        return urls
+        # writes waiting to be sent in a single request
+        self.pendingWrites: List[Dict[str, Union[str, List[List[str]]]]]
+        self.pendingWrites = []
 
-    def getItemUrlsAndTracking (self) -> Dict[str, List[Union[str, bool]]]:
+    def getItemRows (self) -> List[Tuple[str, bool, str]]:
         """
-        Returns a list with the tracking booleans from the worksheet in the predetermined format.
-        In case not a single tracking is written then it will return a list of length urlNum with None's.
-
-        :param urlNum: length of corresponding url list
+        Returns the url, tracking boolean and item price of every item row in the worksheet,
+        fetched in a single request. Missing values are returned as empty strings (False for tracking).
+        Tracking is True for any value other than an empty cell or 'FALSE', 'no' or '0'.
+        Rows after the last url are left out.
         """
 
-        # get all urls
-        all_urls: List[str]
-        all_urls = self.worksheet.col_values(1)[3:]
-
-        # get all trackings
-        all_trackings: List[bool]
-        all_trackings = [bool(i) for i in self.worksheet.col_values(2)[3:]]
+        rows = []
+        for row in self.worksheet.get('A4:C'):
+            # empty cells at the end of a row are not returned
+            url, tracking, price = row + [''] * (3 - len(row))
+            rows.append((url, tracking.strip().lower() not in FALSE_VALUES, price))
 
-        urlNum = len(all_urls)
-        if len(all_trackings) < urlNum:
-            while len(all_trackings) < urlNum:
-                all_trackings.append(False)
+        # drop the rows after the last url
+        while rows and not rows[-1][0]:
+            rows.pop()
 
-        # get all item prices
-        prices: List[str]
-        prices = self.worksheet.col_values(3)[3:]
+        return rows
 
-        if len(prices) < urlNum:
-            while len(prices) < urlNum:
-                prices.append('')
+    def getItemUrlsAndTracking (self) -> Dict[str, List[Union[str, bool, Tuple[str, str]]]]:
+        """
+        Returns a dict with the item urls, the corresponding tracking booleans and the
+        (item price, shipping price) cells to write each item's prices in, from the worksheet
+        in the predetermined format. Items without a tracking value get False.
+        Skips items that already have an item price.
+        """
 
-        # match urls and trackings to prices
-        urls = [url for url, price in zip(all_urls, prices) if not price]
-        trackings = [tracking for tracking, price in zip(all_trackings, prices) if not price]
+        # item rows start from the 4th row
+        rows = [
+            (url, tracking, (f'C{enum}', f'D{enum}'))
+            for enum, (url, tracking, price) in enumerate(self.getItemRows(), start=4)
+            if not price
+        ]
 
         return {
-            'urls': urls,
-            'trackings': trackings,
+            'urls': [url for url, _, _ in rows],
+            'trackings': [tracking for _, tracking, _ in rows],
+            'cells': [cells for _, _, cells in rows],
         }
 
-    def itemPriceCells (self) -> Tuple[str, str]:
-        """
-        Returns the next available (empty) item price cell and the tracking cell next to it.
-        """
-        enum = 4
-        col = 'C{}'
-        tracking = 'D{}'
-        while True:
-            cell = self.worksheet.acell(col.format(enum))
-            if not cell.value:
-                yield (col.format(enum), tracking.format(enum))
-            enum += 1
-
-    def shipPriceCells (self) -> str:
-        """
-        Returns the next available (empty) shipping price cell.
-        """
-        enum = 4
-        col = 'D{}'
-        while True:
-            cell = self.worksheet.acell(col.format(enum))
-            if not cell.value:
-                yield col.format(enum)
-            enum += 1
-
     def write (self, name: str, message: str) -> None:
         """
         Writes the message in the cell with the passed name.
+        Writes are buffered and sent in batches, call flush to send the remaining ones.
 
         :param name: the cell's name
         :param message: message to write in cell
         """
 
-        self.worksheet.update(name, message)
+        self.pendingWrites.append({'range': name, 'values': [[message]]})
+
+        if len(self.pendingWrites) >= self.WRITE_BATCH_SIZE:
+            self.flush()
+
+    def flush (self) -> None:
+        """
+        Sends all the buffered writes in a single request.
+        """
+
+        if not self.pendingWrites:
+            return
+
+        self.worksheet.batch_update(self.pendingWrites)
+        self.pendingWrites = []
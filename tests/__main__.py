@@ -2,6 +2,9 @@
 
 """ Runs the tests. """
 
+import io
+from concurrent.futures import ThreadPoolExecutor
+
 from typing import List
 
 import unittest
@@ -11,26 +14,34 @@ from scraper import driver, scraper, exceptions
 
 # Test classes
 from tests.driver_test import DriverTest
-from tests.scraper_test import ScraperTest
+from tests.scraper_test import ScraperTest, PriceConversionTest
 
-def runTests (tests: List[unittest.TestCase]) -> unittest.runner.TextTestRunner:
+def runTests (tests: List[unittest.TestCase], workers: int = 4) -> List[unittest.TestResult]:
     """
-    Runs tests of all passed unittest.TestCase classes
+    Runs tests of all passed unittest.TestCase classes.
+    Every class runs in its own thread (each test sets up its own driver)
+    and the output of each class is printed once it's done.
 
     :param tests: list of unittest.TestCase classes
+    :param workers: number of test classes to run at the same time
     """
 
     loader = unittest.TestLoader()
 
-    suitesList = []
-    for test in tests:
+    def run (test: unittest.TestCase) -> unittest.TestResult:
         suite = loader.loadTestsFromTestCase(test)
-        suitesList.append(suite)
 
-    bigSuite = unittest.TestSuite(suitesList)
+        # buffer the output so that the output of different classes doesn't get mixed up
+        stream = io.StringIO()
+        runner = unittest.TextTestRunner(stream=stream)
+        results = runner.run(suite)
+
+        print(f'{test.__name__}:\n{stream.getvalue()}')
+
+        return results
 
-    runner = unittest.TextTestRunner()
-    results = runner.run(bigSuite)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run, tests))
 
     return results
 
@@ -38,5 +49,6 @@ if __name__ == '__main__':
     tests = [
         # DriverTest,
         ScraperTest,
+        PriceConversionTest,
         ]
     runTests(tests)
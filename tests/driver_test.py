@@ -3,17 +3,17 @@
 """ Tests for the driver module """
 
 # stdlib modules
+import os
 import unittest
 
-# thrid-party modules
-from selenium.webdriver.common.by import By
-
 # module to be tested
 from __main__ import driver
 
 # exception modules
 from __main__ import exceptions
-from selenium.common.exceptions import NoSuchElementException
+
+# constants
+from scraper.const import COUNTRY_AND_CURRENCY_COOKIE_NAME
 
 class DriverTest (unittest.TestCase):
     """ A class to test the Driver class """
@@ -34,28 +34,50 @@ class DriverTest (unittest.TestCase):
 
     # @unittest.skip
     def test_DriverHeadlessSetUp (self) -> None:
-        """ Tests that the headless Driver set up is working as intended """
+        """ Tests that the headless Driver sets up the country and currency cookie """
         self.driver = driver.Driver(country='united states', currency='usd', headless=True, debug=True)
 
-        # verify that save button is clicked
+        # checking the cookie is enough to know that the country and currency are set up
+        # without reloading the page (test_DriverHeadlessSetUpPage checks the page itself)
+        cookie = self.driver.driver.get_cookie(COUNTRY_AND_CURRENCY_COOKIE_NAME)
+        self.assertIsNotNone(cookie)
+        self.assertIn('region=US', cookie['value'])
+        self.assertIn('c_tp=USD', cookie['value'])
+
+    # reloading the page is slow so this check only runs when DRIVER_TEST_REFRESH is set
+    @unittest.skipUnless(os.environ.get('DRIVER_TEST_REFRESH'), 'set DRIVER_TEST_REFRESH to check the reloaded page')
+    def test_DriverHeadlessSetUpPage (self) -> None:
+        """ Tests that the page shows the country and currency set up by the headless Driver """
+        self.driver = driver.Driver(country='united states', currency='usd', headless=True, debug=True)
+
+        # reload the page so that it's rendered with the injected cookies
         self.driver.driver.refresh()
 
+        # read the flag's class and the currency in a single call
         flag_parent_class = 'ship-to'
-        try:
-            flag_parent = self.driver.driver.find_element(By.CLASS_NAME, flag_parent_class)
-        except NoSuchElementException:
+        currency_class = 'currency'
+        values = self.driver.driver.execute_script(
+            '''
+            const flagParent = document.getElementsByClassName(arguments[0])[0];
+            const flag = flagParent && flagParent.firstElementChild;
+            const currency = document.getElementsByClassName(arguments[1])[0];
+            return {
+                flagParent: Boolean(flagParent),
+                flag: flag ? flag.className : null,
+                currency: currency ? currency.innerText : null,
+            };
+            ''',
+            flag_parent_class,
+            currency_class,
+        )
+
+        if not values['flagParent']:
             raise exceptions.InvalidClassNameNavigationException(url=self.driver.URL, className=flag_parent_class, elementName='settings menu flag parent')
 
-        flag_xpath = './child::*'
-        try:
-            flag = flag_parent.find_element(By.XPATH, flag_xpath)
-        except NoSuchElementException:
-            raise exceptions.InvalidXpathNavigationException(url=self.driver.URL, xpath=flag_xpath, elementName='settings menu flag')
+        if values['flag'] is None:
+            raise exceptions.InvalidXpathNavigationException(url=self.driver.URL, xpath='./child::*', elementName='settings menu flag')
 
-        currency_class = 'currency'
-        try:
-            currency = self.driver.driver.find_element(By.CLASS_NAME, currency_class)
-        except NoSuchElementException:
+        if values['currency'] is None:
             raise exceptions.InvalidClassNameNavigationException(url=self.driver.URL, className=currency_class, elementName='settings menu currency')
 
         expected_values = {
@@ -63,8 +85,8 @@ class DriverTest (unittest.TestCase):
             'currency': 'USD'
         }
 
-        self.assertEqual(currency.text, expected_values['currency'])
-        self.assertEqual(flag.get_attribute('class'), expected_values['flag'])
+        self.assertEqual(values['currency'], expected_values['currency'])
+        self.assertEqual(values['flag'], expected_values['flag'])
 
     def tearDown (self) -> None:
         """ Closes all drivers opened due to tests. """
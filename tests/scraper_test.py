@@ -5,6 +5,7 @@
 # stdlib modules
 import os
 import unittest
+from contextlib import contextmanager
 
 # thrid-party modules
 from selenium.webdriver.common.by import By
@@ -17,18 +18,65 @@ from __main__ import exceptions
 from selenium.common.exceptions import NoSuchElementException
 
 # typing
-from typing import Tuple
+from typing import Tuple, Iterator
 
 # typedef
 Scraper: scraper.Scraper
 Scraper = scraper.Scraper
 
+# file to write the page source to when a test fails
+DEBUG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scraper_debug.html')
+
 class ScraperTest(unittest.TestCase):
     """ A class to test the Scraper class. """
 
+    # (url, tracking, item price, shipping price)
+    EXPECTED_VALUES = [
+        ('https://www.aliexpress.com/item/10000334245846.html', True, 11.0, 0),
+        ('https://www.aliexpress.com/item/1005002202123037.html', True, 0, 0),
+        ('https://www.aliexpress.com/item/32660648792.html', True, 10.8, 0),
+        ('https://www.aliexpress.com/item/4000999946541.html', True, 35.22, 0),
+        ('https://www.aliexpress.com/item/4000221687787.html', True, 2.78, 2.96),
+        ('https://www.aliexpress.com/item/33052582900.html', True, 3.97, 3.11),
+        ('https://www.aliexpress.com/item/4000790011174.html', True, 0, 0),
+        ('https://www.aliexpress.com/item/1005003742432861.html', True, 18.32, 0),
+        ('https://www.aliexpress.com/item/1005003365147552.html', False, 0, 0),
+        ('https://www.aliexpress.com/item/1005003890863335.html', False, 16.46, 0),
+        ('https://www.aliexpress.com/item/1005004047047021.html', True, 18.89, 0),
+        ('https://www.aliexpress.com/item/1005003604897865.html', True, 4.69, 2.95)
+    ]
+
+    @classmethod
+    def setUpClass (cls) -> None:
+        """ Sets up a single Scraper to be shared by all the tests. """
+        cls.scraper = scraper.Scraper(country='united states', currency='eur', headless=True)
+
+    @classmethod
+    def tearDownClass (cls) -> None:
+        """ Closes the shared Scraper. """
+        cls.scraper.close()
+
     def setUp (self) -> None:
-        """ Sets up a windowed Scraper to be used later. """
-        self.scraper = scraper.Scraper(country='united states', currency='eur', headless=True)
+        """ Resets the failure flag read by tearDown. """
+        self.failed = False
+
+    @contextmanager
+    def urlSubTest (self, url: str, record: bool = True) -> Iterator[None]:
+        """
+        Runs a subtest for the passed url and records whether it failed,
+        so that tearDown knows to dump the shared Scraper's page source.
+
+        :param url: url being tested
+        :param record: set to False when the url isn't scraped by the shared Scraper
+        """
+        with self.subTest(url=url):
+            try:
+                yield
+            except unittest.SkipTest:
+                raise
+            except Exception:
+                self.failed = self.failed or record
+                raise
 
     @unittest.skip
     def test_emptyScraper (self) -> None:
@@ -53,30 +101,76 @@ class ScraperTest(unittest.TestCase):
 
         print(f'running test_scrapeURL using {scraper} scraper')
 
-        expected_values = [
-            ('https://www.aliexpress.com/item/10000334245846.html', True, 11.0, 0),
-            ('https://www.aliexpress.com/item/1005002202123037.html', True, 0, 0),
-            ('https://www.aliexpress.com/item/32660648792.html', True, 10.8, 0),
-            ('https://www.aliexpress.com/item/4000999946541.html', True, 35.22, 0),
-            ('https://www.aliexpress.com/item/4000221687787.html', True, 2.78, 2.96),
-            ('https://www.aliexpress.com/item/33052582900.html', True, 3.97, 3.11),
-            ('https://www.aliexpress.com/item/4000790011174.html', True, 0, 0),
-            ('https://www.aliexpress.com/item/1005003742432861.html', True, 18.32, 0),
-            ('https://www.aliexpress.com/item/1005003365147552.html', False, 0, 0),
-            ('https://www.aliexpress.com/item/1005003890863335.html', False, 16.46, 0),
-            ('https://www.aliexpress.com/item/1005004047047021.html', True, 18.89, 0),
-            ('https://www.aliexpress.com/item/1005003604897865.html', True, 4.69, 2.95)
-        ]
-
-        for url, tracking, itemPrice, shipPrice in expected_values:
-            data: Tuple[float, float]
-            data = scraper.scrapeURL(url, tracking)
-            self.assertEqual(data[0], itemPrice, url)
-            self.assertEqual(data[1], shipPrice, url)
+        for url, tracking, itemPrice, shipPrice in self.EXPECTED_VALUES:
+            with self.urlSubTest(url, record=scraper is self.scraper):
+                data: Tuple[float, float]
+                data = scraper.scrapeURL(url, tracking)
+                self.assertAlmostEqual(data[0], itemPrice, places=2, msg=url)
+                self.assertAlmostEqual(data[1], shipPrice, places=2, msg=url)
+
+    # @unittest.skip
+    def test_scrapeURLs (self) -> None:
+        """ Tests the Scraper.scrapeURLs method, which scrapes the urls concurrently. """
+
+        urls, trackings, itemPrices, shipPrices = zip(*self.EXPECTED_VALUES)
+
+        results = Scraper.scrapeURLs(list(urls), list(trackings), country='united states', currency='eur', headless=True, workers=4)
+
+        # the urls are scraped by scrapers of their own, so failures here don't
+        # dump the shared Scraper's page (plain subTest instead of urlSubTest)
+        for url, itemPrice, shipPrice, data in zip(urls, itemPrices, shipPrices, results):
+            with self.subTest(url=url):
+                if isinstance(data, Exception):
+                    raise data
+                self.assertAlmostEqual(data[0], itemPrice, places=2, msg=url)
+                self.assertAlmostEqual(data[1], shipPrice, places=2, msg=url)
 
     def tearDown (self) -> None:
-        """ Closes running Scrapers """
-        filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scraper_debug.html')
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(self.scraper.driver.page_source)
-        self.scraper.close()
+        """ Writes the page source of the shared Scraper for debugging if the test failed """
+        if not self.failed:
+            return
+
+        # outerHTML is read straight from the live DOM, encode it once and write the bytes
+        html = self.scraper.driver.execute_script('return document.documentElement.outerHTML;')
+        with open(DEBUG_PATH, 'wb') as f:
+            f.write(html.encode('utf-8', 'surrogatepass'))
+
+class PriceConversionTest(unittest.TestCase):
+    """ A class to test the price parsing of the Scraper class (no browser needed). """
+
+    # (price string, currency of the scraper, expected price)
+    EXPECTED_VALUES = [
+        ('US $1,234.56', 'usd', 1234.56),
+        ('€ 1.234,56', 'eur', 1234.56),
+        ('₩12,000', 'krw', 12000),
+        ('US $12.34', 'usd', 12.34),
+        ('4,12 €', 'eur', 4.12),
+        ('KWD 1.234', 'kwd', 1.234),
+        ('KWD 1,234.567', 'KWD   (  Kuwaiti Dinar  )', 1234.567),
+        ('1 234,56 руб.', 'rub', 1234.56),
+        ('1\u00a0234\u00a0567 ₫', 'vnd', 1234567),
+        ('US $12.34 123 sold', 'usd', 12.34),
+        ('Shipping: US $2.96\nEstimated delivery on Jul 12', 'usd', 2.96),
+    ]
+
+    @classmethod
+    def setUpClass (cls) -> None:
+        """ Sets up a Scraper without starting a browser, the price parsing doesn't use it. """
+        cls.scraper = Scraper.__new__(Scraper)
+        cls.scraper.currency = None
+
+    def test_convertPriceToFloat (self) -> None:
+        """ Tests the Scraper.convertPriceToFloat method. """
+
+        for price, currency, expected in self.EXPECTED_VALUES:
+            with self.subTest(price=price, currency=currency):
+                self.scraper.currency = currency
+                self.assertAlmostEqual(self.scraper.convertPriceToFloat(price), expected, places=3)
+
+    def test_convertMalformedPriceToFloat (self) -> None:
+        """ Tests that Scraper.convertPriceToFloat raises ValueError when there is no price. """
+
+        for price in ('US $', '. , .', ''):
+            with self.subTest(price=price):
+                with self.assertRaises(ValueError):
+                    self.scraper.convertPriceToFloat(price)
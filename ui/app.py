@@ -8,9 +8,9 @@ import traceback
 import logging
 
 # inner modules
+# (the scraper and sheet manager modules are imported when first needed in on_click
+# since they pull in selenium and gspread which slow the app's start up down)
 from ui import const, apputils
-from scraper import scraper
-from sheetManager import sheet_manager
 
 # gui
 from PyQt5.QtWidgets import QMainWindow
@@ -23,9 +23,6 @@ from PyQt5.QtWidgets import QComboBox
 
 # exceptions
 from scraper.exceptions import *
-from gspread.exceptions import SpreadsheetNotFound
-from gspread.exceptions import NoValidUrlKeyFound
-from requests.exceptions import ConnectionError
 
 # typing
 from typing import Union
@@ -52,16 +49,14 @@ class App (QMainWindow):
         """
         Set up the list of countries.
         """
-        for country in const.countries:
-            self.countryList.addItem(country)
+        self.countryList.addItems(const.countries)
 
 
     def setUpCurrencyList (self) -> None:
         """
         Set up the list of countries.
         """
-        for currency in const.currencies:
-            self.currencyList.addItem(currency)
+        self.currencyList.addItems(const.currencies)
 
     def initUI (self) -> None:
         self.setWindowTitle(self.title)
@@ -172,6 +167,13 @@ class App (QMainWindow):
         To be called when the start button is pressed.
         """
 
+        # heavy modules only needed from here on
+        from scraper import scraper
+        from sheetManager import sheet_manager
+        from gspread.exceptions import SpreadsheetNotFound
+        from gspread.exceptions import NoValidUrlKeyFound
+        from requests.exceptions import ConnectionError
+
         # clear previous errors/info
         # self.clearError()
         # self.clearInfo()
@@ -204,24 +206,24 @@ class App (QMainWindow):
 
             # get urls
             itemDict = sh.getItemUrlsAndTracking()
-            urls, trackings = itemDict['urls'], itemDict['trackings']
+            urls, trackings, cells = itemDict['urls'], itemDict['trackings'], itemDict['cells']
             if not urls:
                 self.enableInput()
                 return None
             # self.displayInfo('Successfully acquired urls.')
 
-            # set up driver
+            # set up the drivers and scrape all the urls concurrently
+            # (the drivers are kept open and reused on the next run with the same country and currency)
             try:
-                # self.displayInfo('Setting up driver...')
-                scr = scraper.Scraper(country=country, currency=currency, headless=True)
-                # self.displayInfo('Successfully set up driver.')
+                # self.displayInfo('Scraping items...')
+                results = scraper.Scraper.scrapeURLs(urls=urls, trackings=trackings, country=country, currency=currency, headless=True, reuse=True)
             except Exception as e:
                 logging.error(f'Error occured while trying to set up the scraper: {e}')
                 self.displayDriverErrorMessage()
                 self.enableInput()
                 return None
 
-            # start feeding the urls to the scraper
+            # write the prices of the items that were scraped
             expectedExceptions = (
                 InvalidXpathNavigationException,
                 InvalidClassNameNavigationException,
@@ -230,38 +232,32 @@ class App (QMainWindow):
                 ConnectionError,
                 )
             error_items = []
-            for url, tracking, (itemCell, shipCell) in zip(urls, trackings, sh.itemPriceCells()):
-                try:
-                    # self.displayInfo(f'Scraping item at {url}...')
-                    itemPrice, shipPrice = scr.scrapeURL(url=url, tracking=tracking)
-                    sh.write(itemCell, itemPrice)
-                    sh.write(shipCell, shipPrice)
-
-                except expectedExceptions as e:
+            for url, tracking, result, (itemCell, shipCell) in zip(urls, trackings, results, cells):
+                if isinstance(result, expectedExceptions):
                     # no need for the loop to stop in case an item is misbehaving
                     error_items.append({
                         'url': url,
                         'tracking': tracking,
-                        'error': e,
+                        'error': result,
                     })
-                    logging.error(f'Error occured while trying to scrape: {url}\nError: {e}')
+                    logging.error(f'Error occured while trying to scrape: {url}\nError: {result}')
                     logging.info(f'Skipping item with url: {url}')
                     continue
 
-                except Exception as e:
+                if isinstance(result, Exception):
                     # we need the loop to stop otherwise
-                    logging.error(f'An unexpected error occured.\n{apputils.exceptionName(e)}: "{e}"\nClosing the app.')
-                    try:
-                        scr.close()
-                    except Exception as e:
-                        logging.error(f'Could not close scraper due to an error: {e}')
+                    logging.error(f'An unexpected error occured.\n{apputils.exceptionName(result)}: "{result}"\nClosing the app.')
                     self.close()
                     break
 
+                itemPrice, shipPrice = result
+                sh.write(itemCell, itemPrice)
+                sh.write(shipCell, shipPrice)
+
             # once the loop is over
 
-            # close the scraper
-            scr.close()
+            # write the remaining prices
+            sh.flush()
 
             # clear the url and reenable the input
             self.clearURL()
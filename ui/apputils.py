@@ -2,16 +2,16 @@
 
 """ A module for helper functions for the ui module """
 
-import re
-
 def exceptionName (exception: Exception) -> str:
     """
     Returns a string of the exceptions full name including the package.
+    (builtin exceptions have no package, i.e. 'ValueError')
 
     :param exception: exception to get the full name of
     """
 
-    pattern = "\'(.*)\'"
-    text = str(type(exception))
+    exceptionType = type(exception)
+    if exceptionType.__module__ == 'builtins':
+        return exceptionType.__qualname__
 
-    return re.search(pattern, text).groups()[0]
+    return f'{exceptionType.__module__}.{exceptionType.__qualname__}'
@@ -2,10 +2,10 @@
 
 """ A module for the lists of supported countries and currencies """
 
-countries = [
+countries = (
     'None', 'Afghanistan', 'Aland Islands', 'Albania', 'Alderney', 'Algeria', 'American Samoa', 'Andorra', 'Angola', 'Anguilla', 'Antigua and Barbuda', 'Argentina', 'Armenia', 'Aruba', 'Ascension Island', 'Australia', 'Austria', 'Azerbaijan', 'Bahamas', 'Bahrain', 'Bangladesh', 'Barbados', 'Belarus', 'Belgium', 'Belize', 'Benin', 'Bermuda', 'Bhutan', 'Bolivia', 'Bosnia and Herzegovina', 'Botswana', 'Brazil', 'Brunei', 'Bulgaria', 'Burkina Faso', 'Burundi', 'Cambodia', 'Cameroon', 'Canada', 'Cape Verde', 'Caribbean Netherlands', 'Cayman Islands', 'Central African Republic', 'Chad', 'Chile', 'Christmas Island', 'Cocos (Keeling) Islands', 'Colombia', 'Comoros', 'Congo, The Democratic Republic Of The', 'Congo, The Republic of Congo', 'Cook Islands', 'Costa Rica', "Cote D'Ivoire", 'Croatia (local name: Hrvatska)', 'Curacao', 'Cyprus', 'Czech Republic', 'Denmark', 'Djibouti', 'Dominica', 'Dominican Republic', 'Ecuador', 'Egypt', 'El Salvador', 'Equatorial Guinea', 'Eritrea', 'Estonia', 'Ethiopia', 'Falkland Islands (Malvinas)', 'Faroe Islands', 'Fiji', 'Finland', 'France', 'French Guiana', 'French Polynesia', 'Gabon', 'Gambia', 'Georgia', 'Germany', 'Ghana', 'Gibraltar', 'Greece', 'Greenland', 'Grenada', 'Guadeloupe', 'Guam', 'Guatemala', 'Guernsey', 'Guinea', 'Guinea-Bissau', 'Guyana', 'Haiti', 'Honduras', 'Hong Kong,China', 'Hungary', 'Iceland', 'India', 'Indonesia', 'Iraq', 'Ireland', 'Israel', 'Italy', 'Jamaica', 'Japan', 'Jersey', 'Jordan', 'Kazakhstan', 'Kenya', 'Kiribati', 'Korea', 'Kosovo', 'Kuwait', 'Kyrgyzstan', "Lao People's Democratic Republic", 'Latvia', 'Lebanon', 'Lesotho', 'Liberia', 'Libya', 'Liechtenstein', 'Lithuania', 'Luxembourg', 'Macau,China', 'Macedonia', 'Madagascar', 'Malawi', 'Malaysia', 'Maldives', 'Mali', 'Malta', 'Marshall Islands', 'Martinique', 'Mauritania', 'Mauritius', 'Mayotte', 'Mexico', 'Micronesia', 'Moldova', 'Monaco', 'Mongolia', 'Montenegro', 'Montserrat', 'Morocco', 'Mozambique', 'Myanmar', 'Namibia', 'Nauru', 'Nepal', 'Netherlands', 'Netherlands Antilles', 'New Caledonia', 'New Zealand', 'Nicaragua', 'Niger', 'Nigeria', 'Niue', 'Norfolk Island', 'Northern Mariana Islands', 'Norway', 'Oman', 'Other Country', 'Pakistan', 'Palau', 'Palestine', 'Panama', 'Papua New Guinea', 'Paraguay', 'Peru', 'Philippines', 'Poland', 'Portugal', 'Puerto Rico', 'Qatar', 'Reunion', 'Romania', 'Russian Federation', 'Rwanda', 'Saint Barthelemy', 'Saint Kitts and Nevis', 'Saint Lucia', 'Saint Martin', 'Saint Vincent and the Grenadines', 'Samoa', 'San Marino', 'Sao Tome and Principe', 'Saudi Arabia', 'Senegal', 'Serbia', 'Seychelles', 'Sierra Leone', 'Singapore', 'Sint Maarten', 'Slovakia (Slovak Republic)', 'Slovenia', 'Solomon Islands', 'Somalia', 'South Africa', 'South Georgia and the South Sandwich Islands', 'South Sudan', 'Spain', 'Sri Lanka', 'St. Pierre and Miquelon', 'Suriname', 'Swaziland', 'Sweden', 'Switzerland', 'Taiwan,China', 'Tajikistan', 'Tanzania', 'Thailand', 'Timor-Leste', 'Togo', 'Tonga', 'Trinidad and Tobago', 'Tunisia', 'Turkey', 'Turkmenistan', 'Turks and Caicos Islands', 'Tuvalu', 'Uganda', 'Ukraine', 'United Arab Emirates', 'United Kingdom', 'United States', 'Uruguay', 'Uzbekistan', 'Vanuatu', 'Vatican City State (Holy See)', 'Venezuela', 'Vietnam', 'Virgin Islands (British)', 'Virgin Islands (U.S.)', 'Wallis And Futuna Islands', 'Yemen', 'Zambia', 'Zanzibar', 'Zimbabwe',
-]
+)
 
-currencies = [
+currencies = (
     'None', 'CHF   (  Swiss Franc  )', 'MXN   (  Mexican Peso  )', 'EUR   (  Euro  )', 'CLP   (  Chilean Peso  )', 'USD   (  US Dollar  )', 'CAD   (  Canadian Dollar  )', 'AUD   (  Australian Dollar  )', 'SGD   (  Singapore Dollar  )', 'KRW   (  South Korean Won  )', 'JPY   (  Japanese Yen  )', 'PLN   (  Polish Zloty  )', 'GBP   (  British Pound  )', 'SEK   (  Swedish Krona  )', 'HUF   (  Hungarian Forint  )', 'NZD   (  New Zealand Dollar  )', 'TRY   (  Turkish Lira  )', 'BRL   (  Brazilian Real  )', 'RUB   (  Russian Ruble  )', 'FJD   (  Fijian Dollar  )', 'STD   (  Sao Tome/Principe Dobra  )', 'SCR   (  Seychelles Rupee  )', 'BBD   (  Barbados Dollar  )', 'GTQ   (  Guatemalan Quetzal  )', 'HNL   (  Honduran Lempira  )', 'UGX   (  Uganda Shilling  )', 'ZAR   (  South African Rand  )', 'TND   (  Tunisian Dinar  )', 'BSD   (  Bahamian Dollar  )', 'SLL   (  Sierra Leone Leone  )', 'IQD   (  Iraqi Dinar  )', 'GMD   (  Gambian Dalasi  )', 'TWD   (  Taiwan Dollar  )', 'RSD   (  Serbian Dinar  )', 'DOP   (  Dominican Peso  )', 'KMF   (  Comoros Franc  )', 'MYR   (  Malaysian Ringgit  )', 'FKP   (  Falkland Islands Pound  )', 'GEL   (  Georgian Lari  )', 'UYU   (  Uruguayan Peso  )', 'MAD   (  Moroccan Dirham  )', 'CVE   (  Cape Verde Escudo  )', "TOP   (  Tongan Pa'anga  )", 'OMR   (  Omani Rial  )', 'AZN   (  Azerbaijan New Manat  )', 'PGK   (  Papua New Guinea Kina  )', 'KES   (  Kenyan Shilling  )', 'UAH   (  Ukrainian Hryvnia  )', 'BTN   (  Bhutan Ngultrum  )', 'GNF   (  Guinea Franc  )', 'ERN   (  Eritrean Nakfa  )', 'SVC   (  El Salvador Colon  )', 'ARS   (  Argentine Peso  )', 'QAR   (  Qatari Riyal  )', 'THB   (  Thai Baht  )', 'UZS   (  Uzbekistan Som  )', 'XPF   (  CFP Franc  )', 'BDT   (  Bangladeshi Taka  )', 'LYD   (  Libyan Dinar  )', 'BMD   (  Bermudian Dollar  )', 'PHP   (  Philippine Peso  )', 'KWD   (  Kuwaiti Dinar  )', 'PYG   (  Paraguay Guarani  )', 'JMD   (  Jamaican Dollar  )', 'ISK   (  Iceland Krona  )', 'COP   (  Colombian Peso  )', 'DZD   (  Algerian Dinar  )', 'PAB   (  Panamanian Balboa  )', 'ETB   (  Ethiopian Birr  )', 'SOS   (  Somali Shilling  )', 'VUV   (  Vanuatu Vatu  )', 'VEF   (  Venezuelan Bolivar Fuerte  )', 'LAK   (  Lao Kip  )', 'BND   (  Bruneian Dollar  )', 'XAF   (  CFA Franc BEAC  )', 'HRK   (  Croatian Kuna  )', 'ALL   (  Albanian Lek  )', 'DJF   (  Djibouti Franc  )', 'TZS   (  Tanzanian Shilling  )', 'VND   (  Vietnamese Dong  )', 'ILS   (  Israeli Shekel  )', 'GHS   (  Ghanaian Cedi  )', 'GYD   (  Guyanan Dollar  )', 'BOB   (  Bolivian Boliviano  )', 'MDL   (  Moldovan Leu  )', 'IDR   (  Indonesian Rupiah  )', 'KYD   (  Cayman Islands Dollar  )', 'AMD   (  Armenian Dram  )', 'BWP   (  Botswana Pula  )', 'SHP   (  St. Helena Pound  )', 'LBP   (  Lebanese Pound  )', 'TJS   (  Tajikistan Somoni  )', 'JOD   (  Jordanian Dinar  )', 'AED   (  Emirati Dirham  )', 'HKD   (  Hong Kong Dollar  )', 'RWF   (  Rwandan Franc  )', 'LSL   (  Lesotho Loti  )', 'DKK   (  Danish Krone  )', 'BGN   (  Bulgarian Lev  )', 'MMK   (  Myanmar Kyat  )', 'MUR   (  Mauritian Rupee  )', 'NOK   (  Norwegian Krone  )', 'GIP   (  Gibraltar Pound  )', 'RON   (  Romanian New Leu  )', 'LKR   (  Sri Lankan Rupee  )', 'NGN   (  Nigerian Naira  )', 'CZK   (  Czech Koruna  )', 'CRC   (  Costa Rican Colon  )', 'PKR   (  Pakistani Rupee  )', 'XCD   (  East Carribean Dollar  )', 'HTG   (  Haitian Gourde  )', 'BHD   (  Bahraini Dinar  )', 'KZT   (  Kazakhstani Tenge  )', 'SRD   (  Suriname Dollar  )', 'SZL   (  Swaziland Lilangeni  )', 'SAR   (  Saudi Arabian Riyal  )', 'TTD   (  Trinidadian Dollar  )', 'YER   (  Yemen Rial  )', 'MVR   (  Maldive Rufiyaa  )', 'AFN   (  Afghan Afghani  )', 'INR   (  Indian Rupee  )', 'AWG   (  Aruban Florin  )', 'NPR   (  Nepalese Rupee  )', 'MNT   (  Mongolian Tugrik  )', 'AOA   (  Angolan Kwanza  )', 'SBD   (  Solomon Islands Dollar  )', 'BYR   (  Belarusian Ruble  )', 'BIF   (  Burundi Franc  )', 'BZD   (  Belize Dollar  )', 'BAM   (  Bosnian Mark  )', 'EGP   (  Egyptian Pound  )', 'MOP   (  Macau Pataca  )', 'NAD   (  Namibia Dollar  )', 'NIO   (  Nicaraguan Cordoba Oro  )', 'PEN   (  Peruvian Sol  )', 'WST   (  Samoan Tala  )', 'TMT   (  Turkmenistan New Manat  )',
-]
+)